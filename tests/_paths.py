@@ -0,0 +1,9 @@
+"""
+Filesystem locations used by the test suite
+"""
+
+from pathlib import Path
+
+
+# Resolved once at import; strict=True fails fast if the plugin file is missing
+PLUGIN_PATH = (Path(__file__).parent.parent / "zsh-uv-env.plugin.zsh").resolve(strict=True)
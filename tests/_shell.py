@@ -0,0 +1,15 @@
+"""
+Shell prerequisite checks shared by the test runner and the pytest fixtures
+"""
+
+import os
+import shutil
+
+
+# Absolute path of the zsh on PATH, or None if there is none
+ZSH = shutil.which('zsh')
+
+
+def _have_zsh():
+    """Return True if zsh is on PATH and executable, without spawning it"""
+    return ZSH is not None and os.access(ZSH, os.X_OK)
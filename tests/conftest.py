@@ -0,0 +1,172 @@
+"""
+Shared pytest fixtures for the zsh-uv-env test suite
+"""
+
+import contextlib
+import os
+import re
+import selectors
+import subprocess
+import time
+from pathlib import Path
+
+import pytest
+
+from _paths import PLUGIN_PATH
+from _shell import ZSH, _have_zsh
+
+
+# Seconds a single script may run before the shell is considered stuck
+SCRIPT_TIMEOUT = 10
+
+# Printed after each script: a newline, then __END__<exit code>__
+_SENTINEL = re.compile(rb"\n__END__(\d+)__\n")
+
+
+class ZshShell:
+    """Long-lived zsh process with the plugin already sourced
+
+    Scripts are written to the shell's stdin and their output is read back
+    up to a ``__END__<exit code>__`` sentinel, so tests pay for zsh startup
+    and plugin parsing once per session instead of once per call.
+
+    If a script hangs or kills the shell, the shell is replaced with a fresh
+    one before the error is raised, so later tests are unaffected.
+    """
+
+    def __init__(self, cwd):
+        self.cwd = Path(cwd)
+        # Errors from the shell itself (plugin sourcing, parse errors)
+        self.shell_stderr_path = self.cwd / "shell.stderr"
+        # Errors from the most recent script
+        self.script_stderr_path = self.cwd / "script.stderr"
+        self._start()
+
+    def _start(self):
+        """Spawn zsh, source the plugin and wait for it to finish loading"""
+        with open(self.shell_stderr_path, "wb") as shell_stderr:
+            self.process = subprocess.Popen(
+                [ZSH, '-s'],
+                stdin=subprocess.PIPE,
+                stdout=subprocess.PIPE,
+                stderr=shell_stderr,
+                cwd=self.cwd,
+                env=os.environ
+            )
+        # Start from a clean slate so loading the plugin activates nothing
+        self.process.stdin.write(
+            f"unset VIRTUAL_ENV\nsource '{PLUGIN_PATH}'\n"
+            f"printf '\\n__END__%s__\\n' $?\n".encode()
+        )
+        self.process.stdin.flush()
+
+        # Consume anything printed at load time so it never reaches a test
+        output, match, failure = self._read_until_sentinel(SCRIPT_TIMEOUT)
+        if failure or match.group(1) != b"0":
+            if match:
+                output = output[:match.start()]
+            self.process.kill()
+            self.process.wait()
+            raise RuntimeError(
+                f"zsh {failure or 'failed'} while sourcing {PLUGIN_PATH}\n"
+                f"--- stdout ---\n{output.decode(errors='replace')}\n"
+                f"--- stderr ---\n{self.shell_stderr_path.read_text(errors='replace')}"
+            )
+
+    def _restart(self):
+        """Kill the current shell and start a fresh one"""
+        self.process.kill()
+        self.process.wait()
+        with contextlib.suppress(BrokenPipeError):
+            self.process.stdin.close()
+        self.process.stdout.close()
+        self._start()
+
+    def _read_until_sentinel(self, timeout):
+        """Read stdout up to the sentinel
+
+        Returns ``(output, match, None)`` on success, or ``(output, None, reason)``
+        if the shell exits or the deadline passes first.
+        """
+        deadline = time.monotonic() + timeout
+        fd = self.process.stdout.fileno()
+        output = b""
+        with selectors.DefaultSelector() as selector:
+            selector.register(fd, selectors.EVENT_READ)
+            while not (match := _SENTINEL.search(output)):
+                remaining = deadline - time.monotonic()
+                if remaining <= 0 or not selector.select(remaining):
+                    return output, None, f"timed out after {timeout}s"
+                chunk = os.read(fd, 65536)
+                if not chunk:
+                    return output, None, "exited"
+                output += chunk
+        return output, match, None
+
+    def run(self, script, timeout=SCRIPT_TIMEOUT, capture_stderr=False):
+        """Run a script in a subshell and return its exit code and stdout
+
+        The subshell keeps environment changes, function definitions and
+        hook registrations from leaking into later calls. The script's stderr
+        goes to /dev/null unless ``capture_stderr`` is set, in which case it is
+        returned as the CompletedProcess's ``stderr``.
+        """
+        if capture_stderr:
+            # Don't report a previous script's errors if this one never starts
+            self.script_stderr_path.unlink(missing_ok=True)
+            stderr_target = self.script_stderr_path
+        else:
+            stderr_target = os.devnull
+        try:
+            self.process.stdin.write(
+                f"(\n{script}\n) 2>'{stderr_target}'\n"
+                f"printf '\\n__END__%s__\\n' $?\n".encode()
+            )
+            self.process.stdin.flush()
+        except BrokenPipeError:
+            output, match, failure = b"", None, "exited"
+        else:
+            output, match, failure = self._read_until_sentinel(timeout)
+
+        if failure:
+            shell_stderr = self.shell_stderr_path.read_text(errors="replace")
+            script_stderr = self._script_stderr() if capture_stderr else ""
+            self._restart()
+            raise RuntimeError(
+                f"zsh {failure} while running the script; started a new shell\n"
+                f"--- script ---\n{script}\n"
+                f"--- stdout ---\n{output.decode(errors='replace')}\n"
+                f"--- stderr ---\n{script_stderr}{shell_stderr}"
+            )
+
+        stdout = output[:match.start()].decode(errors="replace")
+        stderr = self._script_stderr() if capture_stderr else None
+        return subprocess.CompletedProcess(script, int(match.group(1)), stdout, stderr)
+
+    def _script_stderr(self):
+        """Return what the last script wrote to stderr"""
+        try:
+            return self.script_stderr_path.read_text(errors="replace")
+        except FileNotFoundError:
+            return ""
+
+    def close(self):
+        """Let the shell exit and reap it"""
+        with contextlib.suppress(BrokenPipeError):
+            self.process.stdin.close()
+        try:
+            self.process.wait(timeout=SCRIPT_TIMEOUT)
+        except subprocess.TimeoutExpired:
+            self.process.kill()
+            self.process.wait()
+        self.process.stdout.close()
+
+
+@pytest.fixture(scope="session")
+def zsh_shell(tmp_path_factory):
+    """One pre-sourced zsh per test session (per worker under xdist)"""
+    if not _have_zsh():
+        pytest.fail("zsh not found. Please install zsh to run these tests.")
+    shell = ZshShell(cwd=tmp_path_factory.mktemp("zsh"))
+    yield shell
+    shell.close()
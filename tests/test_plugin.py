@@ -1,6 +1,6 @@
 # /// script
 # requires-python = ">=3.13"
-# dependencies = []
+# dependencies = ["pytest", "pytest-xdist"]
 # ///
 #!/usr/bin/env python3
 """
@@ -10,215 +10,160 @@ This test suite validates the core functionality of the zsh-uv-env plugin
 by testing individual functions in isolation using shell subprocess calls.
 """
 
-import os
-import tempfile
+import re
+import shlex
 import subprocess
-import shutil
 import sys
-from pathlib import Path
-
-
-class PluginTester:
-    """Test harness for zsh-uv-env plugin functionality"""
-    
-    def __init__(self):
-        self.plugin_path = Path(__file__).parent.parent / "zsh-uv-env.plugin.zsh"
-        self.test_count = 0
-        self.passed_count = 0
-        
-    def run_zsh_function(self, function_call, env_vars=None):
-        """Execute a zsh function from the plugin and return result"""
-        # Source the plugin and call the function
-        cmd = f"""
-        source '{self.plugin_path}'
-        {function_call}
-        """
-        
-        result = subprocess.run(
-            ['zsh', '-c', cmd],
-            capture_output=True,
-            text=True,
-            env={**os.environ, **(env_vars or {})}
-        )
-        
-        return result
-    
-    def assert_equals(self, expected, actual, test_name):
-        """Simple assertion helper"""
-        self.test_count += 1
-        if expected == actual:
-            print(f"✓ {test_name}")
-            self.passed_count += 1
-        else:
-            print(f"✗ {test_name}")
-            print(f"  Expected: {expected}")
-            print(f"  Actual: {actual}")
-    
-    def assert_exit_code(self, expected_code, result, test_name):
-        """Assert subprocess exit code"""
-        self.assert_equals(expected_code, result.returncode, test_name)
-    
-    def test_is_venv_active(self):
-        """Test is_venv_active function"""
-        print("\n=== Testing is_venv_active function ===")
-        
-        # Test when no VIRTUAL_ENV is set (unset any existing VIRTUAL_ENV)
-        result = self.run_zsh_function("unset VIRTUAL_ENV; is_venv_active")
-        self.assert_exit_code(1, result, "is_venv_active returns 1 when no VIRTUAL_ENV set")
-        
-        # Test when VIRTUAL_ENV is set
-        result = self.run_zsh_function(
-            "is_venv_active", 
-            env_vars={"VIRTUAL_ENV": "/some/venv/path"}
-        )
-        self.assert_exit_code(0, result, "is_venv_active returns 0 when VIRTUAL_ENV is set")
-        
-        # Test with empty VIRTUAL_ENV
-        result = self.run_zsh_function(
-            "is_venv_active",
-            env_vars={"VIRTUAL_ENV": ""}
+
+import pytest
+
+
+# Delimiter echoed after each probe: ---MARK:<label>:<exit code>---
+PROBE_MARK = re.compile(r"(.*?)---MARK:([\w-]+):(\d+)---\n", re.DOTALL)
+
+
+def run_zsh_function(zsh_shell, probes, capture_stderr=False):
+    """Execute several plugin probes in a single round trip to the shell
+
+    Each probe is a ``(label, snippet, env_vars)`` tuple. Every snippet runs
+    in its own subshell of the pre-sourced session shell, so state changed by
+    one probe does not leak into the next. Returns a dict mapping each label
+    to a CompletedProcess holding that probe's exit code and stdout. With
+    ``capture_stderr``, the stderr shared by all probes is attached too.
+    """
+    lines = []
+    for label, snippet, env_vars in probes:
+        exports = "".join(
+            f"export {name}={shlex.quote(value)}; "
+            for name, value in (env_vars or {}).items()
         )
-        self.assert_exit_code(1, result, "is_venv_active returns 1 when VIRTUAL_ENV is empty")
-    
-    def test_find_venv(self):
-        """Test find_venv function with various directory structures"""
-        print("\n=== Testing find_venv function ===")
-        
-        with tempfile.TemporaryDirectory() as temp_dir:
-            temp_path = Path(temp_dir)
-            
-            # Test: no .venv directory found
-            result = self.run_zsh_function(f"cd '{temp_path}' && find_venv")
-            self.assert_exit_code(1, result, "find_venv returns 1 when no .venv found")
-            
-            # Test: .venv in current directory
-            venv_dir = temp_path / ".venv"
-            venv_dir.mkdir()
-            
-            result = self.run_zsh_function(f"cd '{temp_path}' && find_venv")
-            self.assert_exit_code(0, result, "find_venv returns 0 when .venv in current dir")
-            self.assert_equals(str(venv_dir), result.stdout.strip(), "find_venv outputs correct path")
-            
-            # Test: .venv in parent directory
-            subdir = temp_path / "subdir"
-            subdir.mkdir()
-            
-            result = self.run_zsh_function(f"cd '{subdir}' && find_venv")
-            self.assert_exit_code(0, result, "find_venv returns 0 when .venv in parent dir")
-            self.assert_equals(str(venv_dir), result.stdout.strip(), "find_venv finds parent .venv")
-            
-            # Test: nested subdirectories
-            deep_dir = subdir / "deep" / "nested"
-            deep_dir.mkdir(parents=True)
-            
-            result = self.run_zsh_function(f"cd '{deep_dir}' && find_venv")
-            self.assert_exit_code(0, result, "find_venv traverses multiple parent directories")
-            self.assert_equals(str(venv_dir), result.stdout.strip(), "find_venv finds ancestor .venv")
-    
-    def test_hook_registration(self):
-        """Test hook registration functions"""
-        print("\n=== Testing hook registration ===")
-        
-        # Test activation hook registration
-        result = self.run_zsh_function("""
+        lines.append(f"( {exports}\n{snippet}\n)")
+        lines.append(f'echo "---MARK:{label}:$?---"')
+
+    result = zsh_shell.run("\n".join(lines), capture_stderr=capture_stderr)
+
+    results = {
+        label: subprocess.CompletedProcess(label, int(code), stdout, result.stderr)
+        for stdout, label, code in PROBE_MARK.findall(result.stdout)
+    }
+
+    missing = [label for label, _, _ in probes if label not in results]
+    assert not missing, (
+        f"probes {missing} produced no ---MARK--- line\n"
+        f"stdout:\n{result.stdout}\n"
+        f"stderr:\n{result.stderr if capture_stderr else '(not captured; pass capture_stderr=True)'}"
+    )
+
+    return results
+
+
+def test_is_venv_active(zsh_shell):
+    """Test is_venv_active function"""
+    results = run_zsh_function(zsh_shell, [
+        # No VIRTUAL_ENV set (unset any existing VIRTUAL_ENV)
+        ("unset", "unset VIRTUAL_ENV; is_venv_active", None),
+        ("set", "is_venv_active", {"VIRTUAL_ENV": "/some/venv/path"}),
+        ("empty", "is_venv_active", {"VIRTUAL_ENV": ""}),
+    ])
+
+    assert results["unset"].returncode == 1, "is_venv_active returns 1 when no VIRTUAL_ENV set"
+    assert results["set"].returncode == 0, "is_venv_active returns 0 when VIRTUAL_ENV is set"
+    assert results["empty"].returncode == 1, "is_venv_active returns 1 when VIRTUAL_ENV is empty"
+
+
+def test_find_venv(zsh_shell, tmp_path):
+    """Test find_venv function with various directory structures"""
+    empty_dir = tmp_path / "empty"
+    empty_dir.mkdir()
+
+    project_dir = tmp_path / "project"
+    venv_dir = project_dir / ".venv"
+    venv_dir.mkdir(parents=True)
+
+    subdir = project_dir / "subdir"
+    deep_dir = subdir / "deep" / "nested"
+    deep_dir.mkdir(parents=True)
+
+    results = run_zsh_function(zsh_shell, [
+        ("none", f"cd '{empty_dir}' && find_venv", None),
+        ("current", f"cd '{project_dir}' && find_venv", None),
+        ("parent", f"cd '{subdir}' && find_venv", None),
+        ("ancestor", f"cd '{deep_dir}' && find_venv", None),
+    ])
+
+    # No .venv directory found
+    assert results["none"].returncode == 1, "find_venv returns 1 when no .venv found"
+
+    # .venv in current directory
+    assert results["current"].returncode == 0, "find_venv returns 0 when .venv in current dir"
+    assert results["current"].stdout.strip() == str(venv_dir), "find_venv outputs correct path"
+
+    # .venv in parent directory
+    assert results["parent"].returncode == 0, "find_venv returns 0 when .venv in parent dir"
+    assert results["parent"].stdout.strip() == str(venv_dir), "find_venv finds parent .venv"
+
+    # Nested subdirectories
+    assert results["ancestor"].returncode == 0, "find_venv traverses multiple parent directories"
+    assert results["ancestor"].stdout.strip() == str(venv_dir), "find_venv finds ancestor .venv"
+
+
+def test_hook_registration(zsh_shell):
+    """Test hook registration functions"""
+    results = run_zsh_function(zsh_shell, [
+        ("activate", """
         zsh_uv_add_post_hook_on_activate 'echo "activated"'
         echo ${#ZSH_UV_ACTIVATE_HOOKS[@]}
-        """)
-        self.assert_exit_code(0, result, "Activation hook registration succeeds")
-        self.assert_equals("1", result.stdout.strip(), "One activation hook registered")
-        
-        # Test deactivation hook registration
-        result = self.run_zsh_function("""
+        """, None),
+        ("deactivate", """
         zsh_uv_add_post_hook_on_deactivate 'echo "deactivated"'
         echo ${#ZSH_UV_DEACTIVATE_HOOKS[@]}
-        """)
-        self.assert_exit_code(0, result, "Deactivation hook registration succeeds")
-        self.assert_equals("1", result.stdout.strip(), "One deactivation hook registered")
-        
-        # Test multiple hooks
-        result = self.run_zsh_function("""
+        """, None),
+        ("multiple", """
         zsh_uv_add_post_hook_on_activate 'hook1'
         zsh_uv_add_post_hook_on_activate 'hook2'
         echo ${#ZSH_UV_ACTIVATE_HOOKS[@]}
-        """)
-        self.assert_equals("2", result.stdout.strip(), "Multiple activation hooks registered")
-    
-    def test_hook_execution(self):
-        """Test that hooks are executed properly"""
-        print("\n=== Testing hook execution ===")
-        
-        # Test activation hook execution
-        result = self.run_zsh_function("""
+        """, None),
+    ])
+
+    assert results["activate"].returncode == 0, "Activation hook registration succeeds"
+    assert results["activate"].stdout.strip() == "1", "One activation hook registered"
+
+    assert results["deactivate"].returncode == 0, "Deactivation hook registration succeeds"
+    assert results["deactivate"].stdout.strip() == "1", "One deactivation hook registered"
+
+    assert results["multiple"].stdout.strip() == "2", "Multiple activation hooks registered"
+
+
+def test_hook_execution(zsh_shell):
+    """Test that hooks are executed properly"""
+    results = run_zsh_function(zsh_shell, [
+        ("activate", """
         test_hook() { echo "hook executed"; }
         zsh_uv_add_post_hook_on_activate 'test_hook'
         _run_activate_hooks
-        """)
-        self.assert_exit_code(0, result, "Activation hooks execute without error")
-        self.assert_equals("hook executed", result.stdout.strip(), "Activation hook produces expected output")
-        
-        # Test deactivation hook execution  
-        result = self.run_zsh_function("""
+        """, None),
+        ("deactivate", """
         test_deactivate_hook() { echo "deactivate hook executed"; }
         zsh_uv_add_post_hook_on_deactivate 'test_deactivate_hook'
         _run_deactivate_hooks
-        """)
-        self.assert_exit_code(0, result, "Deactivation hooks execute without error")
-        self.assert_equals("deactivate hook executed", result.stdout.strip(), "Deactivation hook produces expected output")
-    
-    def test_autoenv_activated_flag(self):
-        """Test AUTOENV_ACTIVATED flag behavior"""
-        print("\n=== Testing AUTOENV_ACTIVATED flag ===")
-        
-        # Test initial state
-        result = self.run_zsh_function("echo $AUTOENV_ACTIVATED")
-        self.assert_equals("0", result.stdout.strip(), "AUTOENV_ACTIVATED starts at 0")
-        
-        # Test setting flag
-        result = self.run_zsh_function("""
-        AUTOENV_ACTIVATED=1
-        echo $AUTOENV_ACTIVATED
-        """)
-        self.assert_equals("1", result.stdout.strip(), "AUTOENV_ACTIVATED can be set to 1")
-    
-    def run_all_tests(self):
-        """Run all test methods"""
-        print("Running zsh-uv-env plugin tests...")
-        print(f"Plugin path: {self.plugin_path}")
-        
-        # Check if plugin file exists
-        if not self.plugin_path.exists():
-            print(f"ERROR: Plugin file not found at {self.plugin_path}")
-            return False
-        
-        # Check if zsh is available
-        try:
-            subprocess.run(['zsh', '--version'], capture_output=True, check=True)
-        except (subprocess.CalledProcessError, FileNotFoundError):
-            print("ERROR: zsh not found. Please install zsh to run these tests.")
-            return False
-        
-        # Run all test methods
-        self.test_is_venv_active()
-        self.test_find_venv()
-        self.test_hook_registration()
-        self.test_hook_execution()
-        self.test_autoenv_activated_flag()
-        
-        # Print summary
-        print(f"\n=== Test Summary ===")
-        print(f"Total tests: {self.test_count}")
-        print(f"Passed: {self.passed_count}")
-        print(f"Failed: {self.test_count - self.passed_count}")
-        
-        if self.passed_count == self.test_count:
-            print("✓ All tests passed!")
-            return True
-        else:
-            print("✗ Some tests failed!")
-            return False
+        """, None),
+    ])
+
+    assert results["activate"].returncode == 0, "Activation hooks execute without error"
+    assert results["activate"].stdout.strip() == "hook executed", "Activation hook produces expected output"
+
+    assert results["deactivate"].returncode == 0, "Deactivation hooks execute without error"
+    assert results["deactivate"].stdout.strip() == "deactivate hook executed", "Deactivation hook produces expected output"
+
+
+def test_autoenv_activated_flag(zsh_shell):
+    """Test AUTOENV_ACTIVATED flag behavior"""
+    results = run_zsh_function(zsh_shell, [
+        ("initial", "echo $AUTOENV_ACTIVATED", None),
+    ])
+
+    assert results["initial"].stdout.strip() == "0", "AUTOENV_ACTIVATED starts at 0"
 
 
 if __name__ == "__main__":
-    tester = PluginTester()
-    success = tester.run_all_tests()
-    sys.exit(0 if success else 1)
\ No newline at end of file
+    sys.exit(pytest.main([__file__, "--tb=short", *sys.argv[1:]]))